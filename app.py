@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -11,11 +12,243 @@ st.set_page_config(layout="wide", page_title="Retail Sales Dashboard")
 # --- Load the cleaned dataset ---
 @st.cache_data
 def load_data():
-    df = pd.read_csv('merged_data.csv', parse_dates=['Date'])
+    df = pd.read_parquet('merged_data.parquet')
+    # Month_Name/Type stay categorical (see convert_to_parquet.py); the remaining string column goes to Arrow
+    df['Day_Name'] = df['Day_Name'].astype('string[pyarrow]')
+    # Keep rows in date order so date ranges can be sliced with searchsorted
+    df = df.sort_values('Date', kind='stable').reset_index(drop=True)
     return df
 
 df = load_data()
 
+# --- Holiday filter views, keyed by the sidebar "Holiday Weeks Only?" option ---
+# The st.cache_resource helpers in this file (holiday_views, per_store_dept_frames)
+# hand back the same frames without copying; callers must not mutate them
+@st.cache_resource
+def holiday_views(df):
+    return {
+        'All': df,
+        'Yes': df[df['IsHoliday_x']].reset_index(drop=True),
+        'No': df[~df['IsHoliday_x']].reset_index(drop=True),
+    }
+
+def date_slice(frame, start, end):
+    # frame must be sorted by Date, so the range is a contiguous slice
+    lo, hi = np.searchsorted(
+        frame['Date'].to_numpy(),
+        [np.datetime64(start), np.datetime64(end) + np.timedelta64(1, 'D')]
+    )
+    return frame.iloc[lo:hi]
+
+# --- Holiday type per row, from the holiday flag columns ---
+HOLIDAY_FLAGS = {
+    'IsSuperBowl': 'Super Bowl',
+    'IsLaborDay': 'Labor Day',
+    'IsThanksgiving': 'Thanksgiving',
+    'IsChristmas': 'Christmas',
+}
+
+HOLIDAY_TYPES = np.array(['None', *HOLIDAY_FLAGS.values()])
+
+def holiday_type_codes(frame):
+    # Index into HOLIDAY_TYPES; 0 means no holiday
+    return np.select(
+        [frame[col].to_numpy() for col in HOLIDAY_FLAGS],
+        np.arange(1, len(HOLIDAY_TYPES)),
+        default=0
+    )
+
+def holiday_type(frame):
+    return HOLIDAY_TYPES[holiday_type_codes(frame)]
+
+# --- Sales around holidays (2 weeks before & after) ---
+HOLIDAY_DATES = {
+    'Super Bowl': ['2010-02-12', '2011-02-11', '2012-02-10', '2013-02-08'],
+    'Labor Day': ['2010-09-10', '2011-09-09', '2012-09-07', '2013-09-06'],
+    'Thanksgiving': ['2010-11-26', '2011-11-25', '2012-11-23', '2013-11-29'],
+    'Christmas': ['2010-12-31', '2011-12-30', '2012-12-28', '2013-12-27'],
+}
+
+@st.cache_data
+def compute_holiday_trend(df):
+    events = pd.DataFrame(
+        [(name, pd.Timestamp(d)) for name, dates in HOLIDAY_DATES.items() for d in dates],
+        columns=['Event', 'Holiday_Date']
+    ).sort_values('Holiday_Date', ignore_index=True)
+    events['Date'] = events['Holiday_Date']
+
+    # Match every row to the holiday up to 2 weeks before it and the one up to 2 weeks after it;
+    # a week can sit in two windows (e.g. Thanksgiving/Christmas 2013) and counts for both
+    sales = df[['Date', 'Weekly_Sales']].sort_values('Date', kind='stable')
+    window = pd.Timedelta(weeks=2)
+    combined_trends = pd.concat([
+        pd.merge_asof(sales, events, on='Date', direction='backward', tolerance=window),
+        pd.merge_asof(sales, events, on='Date', direction='forward', tolerance=window, allow_exact_matches=False)
+    ]).dropna(subset=['Event'])
+    combined_trends['Delta_Week'] = (combined_trends['Date'] - combined_trends['Holiday_Date']).dt.days // 7
+
+    return combined_trends.groupby(['Delta_Week', 'Event'])['Weekly_Sales'].mean().reset_index()
+
+
+# --- Per-selection frames for the Store/Dept dropdowns ---
+@st.cache_resource
+def per_store_dept_frames(df):
+    return {key: group for key, group in df.groupby(['Store', 'Dept'], sort=False)}
+
+# Size is fixed per store, so this is one row per store
+@st.cache_data
+def store_size_totals(df):
+    return df.groupby(['Store', 'Size'])['Weekly_Sales'].sum().reset_index()
+
+
+# --- Selectbox-driven results, memoized per session ---
+def session_memo(key, compute, *args):
+    # Unrelated widget changes rerun the script; reuse the result computed for the same selection
+    if key not in st.session_state:
+        st.session_state[key] = compute(*args)
+    return st.session_state[key]
+
+def dept_histogram(df, dept):
+    return np.histogram(df.loc[df['Dept'] == dept, 'Weekly_Sales'].to_numpy(), bins=30)
+
+def compute_lift(df, store, dept):
+    # Filter data by store and dept
+    df_filtered = per_store_dept_frames(df).get((store, dept), df.iloc[0:0])
+
+    # Average sales per holiday type in one bincount pass, compared against non-holiday ('None') weeks
+    codes = holiday_type_codes(df_filtered)
+    counts = np.bincount(codes, minlength=len(HOLIDAY_TYPES))
+    sums = np.bincount(codes, weights=df_filtered['Weekly_Sales'].to_numpy(), minlength=len(HOLIDAY_TYPES))
+    seen = counts > 0
+    holiday_means = pd.Series(sums[seen] / counts[seen], index=pd.Index(HOLIDAY_TYPES[seen], name='Holiday_Type'))
+    non_holiday_sales_avg = holiday_means.get('None', np.nan)
+
+    # Avoid division by zero
+    if not non_holiday_sales_avg:
+        non_holiday_sales_avg = np.nan
+
+    df_lift = (
+        holiday_means.drop('None', errors='ignore')
+        .rename('Holiday_Week_Avg_Sales')
+        .to_frame()
+        .assign(
+            Non_Holiday_Week_Avg_Sales=non_holiday_sales_avg,
+            Sales_Lift_Percent=lambda d: (d['Holiday_Week_Avg_Sales'] - non_holiday_sales_avg) / non_holiday_sales_avg * 100
+        )
+        .reset_index()
+        .dropna()
+    )
+
+    return df_lift
+
+
+# --- Store/Dept options shared by the selectboxes ---
+@st.cache_data
+def dropdown_options(df):
+    return sorted(df['Store'].unique().tolist()), sorted(df['Dept'].unique().tolist())
+
+
+# --- Cached chart aggregates ---
+MONTHLY_ORDER = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+@st.cache_data
+def monthly_totals(df):
+    return (
+        df.groupby('Month_Name', observed=True)['Weekly_Sales']
+        .sum()
+        .reindex(MONTHLY_ORDER)
+        .reset_index()
+        .rename(columns={'Month_Name': 'Month', 'Weekly_Sales': 'Sales'})
+    )
+
+@st.cache_data
+def week_totals(df):
+    return (
+        df.groupby('Week')['Weekly_Sales']
+        .sum()
+        .reset_index()
+        .rename(columns={'Week': 'Week_Number', 'Weekly_Sales': 'Sales'})
+    )
+
+@st.cache_data
+def dept_totals(df):
+    return (
+        df.groupby('Dept')['Weekly_Sales']
+        .sum()
+        .reset_index()
+        .sort_values('Weekly_Sales', ascending=False)
+    )
+
+def binned_means(values, sales, n_bins):
+    # Equal-width bins matching pd.cut(values, bins=n_bins): right-closed, lowest edge nudged down 0.1%
+    lo, hi = values.min(), values.max()
+    edges = np.linspace(lo, hi, n_bins + 1)
+    edges[0] -= (hi - lo) * 0.001
+    bin_ids = np.digitize(values, edges[1:-1], right=True)
+    means = pd.Series(sales).groupby(bin_ids).mean()
+
+    # Label only the surviving bins, formatted the way pd.cut formats its intervals
+    labels = pd.cut(np.array([], dtype=float), bins=edges).categories.astype(str)
+    return pd.DataFrame({'Range': labels[means.index], 'Average Weekly Sales': means.to_numpy()})
+
+@st.cache_data
+def fuel_bin_means(df):
+    fuel_sales = binned_means(df['Fuel_Price'].to_numpy(), df['Weekly_Sales'].to_numpy(), 5)
+    return fuel_sales.rename(columns={'Range': 'Fuel Price Range'})
+
+@st.cache_data
+def temp_bin_means(df):
+    temp_sales = binned_means(df['Temperature'].to_numpy(), df['Weekly_Sales'].to_numpy(), 6)
+    return temp_sales.rename(columns={'Range': 'Temperature Range'})
+
+@st.cache_data
+def type_totals(df):
+    return (
+        df.groupby('Type', observed=True)['Weekly_Sales']
+        .sum()
+        .reset_index()
+        .sort_values('Weekly_Sales', ascending=False)
+    )
+
+
+# --- Line chart downsampling (Largest-Triangle-Three-Buckets) ---
+# Guard for future, longer series: a single Store/Dept series in the current
+# dataset (2010-02-05 to 2012-10-26) has at most 143 points, so this never triggers today
+LINE_CHART_MAX_POINTS = 2000
+
+def lttb_indices(x, y, n_out):
+    # Indices of the points LTTB keeps; first and last points are always kept
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype('int64').astype(float) if np.issubdtype(x.dtype, np.datetime64) else x.astype(float)
+    y = y.astype(float)
+    every = (n - 2) / (n_out - 2)
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        # Average of the next bucket is the third corner of the triangle
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+
 # -----------------------------
 # Sidebar: Logo and Filters
 # -----------------------------
@@ -36,20 +269,11 @@ holiday_filter = st.sidebar.selectbox(
     options=["All", "Yes", "No"]
 )
 
-# Filter dataframe
-df_filtered = df.copy()
-
-# Date range filter
-df_filtered = df_filtered[
-    (df_filtered['Date'] >= pd.to_datetime(date_range[0])) &
-    (df_filtered['Date'] <= pd.to_datetime(date_range[1]))
-]
+# Holiday filter + date range filter
+df_view = holiday_views(df)[holiday_filter]
+df_filtered = date_slice(df_view, date_range[0], date_range[1])
 
-# Holiday filter
-if holiday_filter == "Yes":
-    df_filtered = df_filtered[df_filtered['IsHoliday_x'] == True]
-elif holiday_filter == "No":
-    df_filtered = df_filtered[df_filtered['IsHoliday_x'] == False]
+store_options, dept_options = dropdown_options(df)
 
 
 
@@ -96,10 +320,14 @@ with tab1:
     st.header("📍 Overview")
     st.markdown("High-level summary of sales trends for the selected store and department.")
 
-    # KPI values
-    total_sales = f"${df_filtered['Weekly_Sales'].sum():,.2f}"
-    avg_sales = f"${df_filtered['Weekly_Sales'].mean():,.2f}"
-    max_sales = f"${df_filtered['Weekly_Sales'].max():,.2f}"
+    # KPI values (mean derived from the sum, so the column is reduced twice instead of three times)
+    sales = df_filtered['Weekly_Sales'].to_numpy()
+    sales_sum = sales.sum()
+    sales_avg = sales_sum / sales.size if sales.size else np.nan
+    sales_max = sales.max() if sales.size else np.nan
+    total_sales = f"${sales_sum:,.2f}"
+    avg_sales = f"${sales_avg:,.2f}"
+    max_sales = f"${sales_max:,.2f}"
 
     kpi1, kpi2, kpi3 = st.columns(3)
     with kpi1:
@@ -122,34 +350,39 @@ with tab1:
     with col1:
         store_for_chart = st.selectbox(
             "🏪 Select Store for Weekly Sales Chart",
-            options=sorted(df['Store'].unique())
+            options=store_options
         )
     with col2:
         dept_for_chart = st.selectbox(
             "📦 Select Department for Weekly Sales Chart",
-            options=sorted(df['Dept'].unique())
+            options=dept_options
         )
 
     # Filter df for weekly sales chart based on above selects + date range + holiday filter (optional)
-    df_chart_filtered = df[
-        (df['Store'] == store_for_chart) &
-        (df['Dept'] == dept_for_chart) &
-        (df['Date'] >= pd.to_datetime(date_range[0])) &
-        (df['Date'] <= pd.to_datetime(date_range[1]))
-    ]
+    df_chart = per_store_dept_frames(df).get((store_for_chart, dept_for_chart), df.iloc[0:0])
+    df_chart_filtered = date_slice(df_chart, date_range[0], date_range[1])
     if holiday_filter == "Yes":
-        df_chart_filtered = df_chart_filtered[df_chart_filtered['IsHoliday_x'] == True]
+        df_chart_filtered = df_chart_filtered[df_chart_filtered['IsHoliday_x']]
     elif holiday_filter == "No":
-        df_chart_filtered = df_chart_filtered[df_chart_filtered['IsHoliday_x'] == False]
+        df_chart_filtered = df_chart_filtered[~df_chart_filtered['IsHoliday_x']]
 
     # Weekly Sales Line Chart
-    fig_weekly = px.line(
-        df_chart_filtered.sort_values('Date'),
-        x='Date',
-        y='Weekly_Sales',
+    # Already in date order: load_data sorts df by Date and groupby keeps row order within each group
+    chart_dates = df_chart_filtered['Date'].to_numpy()
+    chart_sales = df_chart_filtered['Weekly_Sales'].to_numpy()
+    if len(chart_sales) > LINE_CHART_MAX_POINTS:  # never true for the current dataset
+        kept = lttb_indices(chart_dates, chart_sales, LINE_CHART_MAX_POINTS)
+        chart_dates, chart_sales = chart_dates[kept], chart_sales[kept]
+
+    fig_weekly = go.Figure(go.Scattergl(
+        x=chart_dates,
+        y=chart_sales,
+        mode='lines+markers'
+    ))
+    fig_weekly.update_layout(
         title=f"Weekly Sales Over Time for Store {store_for_chart}, Dept {dept_for_chart}",
-        labels={"Weekly_Sales": "Weekly Sales", "Date": "Date"},
-        markers=True
+        xaxis_title="Date",
+        yaxis_title="Weekly Sales"
     )
     st.plotly_chart(fig_weekly, use_container_width=True)
     st.markdown("✅ **Insight:** Look for trends, spikes or drops which might correspond to marketing campaigns, holidays or other events.")
@@ -157,17 +390,7 @@ with tab1:
     st.markdown("<br><br>", unsafe_allow_html=True)
     # Monthly Sales Bar Chart
     st.markdown("#### 📅 Total Sales by Month")
-    monthly_order = [
-        'January', 'February', 'March', 'April', 'May', 'June',
-        'July', 'August', 'September', 'October', 'November', 'December'
-    ]
-    monthly_sales = (
-        df_filtered.groupby('Month_Name')['Weekly_Sales']
-        .sum()
-        .reindex(monthly_order)
-        .reset_index()
-        .rename(columns={'Month_Name': 'Month', 'Weekly_Sales': 'Sales'})
-    )
+    monthly_sales = monthly_totals(df_filtered)
     fig_monthly = px.bar(
         monthly_sales,
         x='Month',
@@ -177,7 +400,7 @@ with tab1:
         title="Total Sales by Month"
     )
     fig_monthly.update_layout(
-        xaxis=dict(categoryorder='array', categoryarray=monthly_order),
+        xaxis=dict(categoryorder='array', categoryarray=MONTHLY_ORDER),
         yaxis_title="Total Sales",
         showlegend=False
     )
@@ -186,21 +409,17 @@ with tab1:
 
     st.markdown("<br><br>", unsafe_allow_html=True)
     st.markdown("#### 📊 Sales by Week Number")
-    week_sales = (
-        df_filtered.groupby('Week')['Weekly_Sales']
-        .sum()
-        .reset_index()
-        .rename(columns={'Week': 'Week_Number', 'Weekly_Sales': 'Sales'})
-    )
-    fig_week = px.bar(
-        week_sales,
-        x='Week_Number',
-        y='Sales',
-        title="Sales by Week Number",
-        color='Sales',
-        color_continuous_scale=px.colors.sequential.Viridis
-    )
-    fig_week.update_layout(yaxis_title="Total Sales", xaxis_title="Week Number", showlegend=False)
+    week_sales = week_totals(df_filtered)
+    fig_week = go.Figure(go.Bar(
+        x=week_sales['Week_Number'].to_numpy(),
+        y=week_sales['Sales'].to_numpy(),
+        marker=dict(
+            color=week_sales['Sales'].to_numpy(),
+            colorscale=px.colors.sequential.Viridis,
+            colorbar=dict(title='Sales')
+        )
+    ))
+    fig_week.update_layout(title="Sales by Week Number", yaxis_title="Total Sales", xaxis_title="Week Number", showlegend=False)
     st.plotly_chart(fig_week, use_container_width=True)
     st.markdown("✅ **Insight:** Shows how sales vary across weeks of the year.")
 
@@ -209,17 +428,7 @@ with tab2:
     st.markdown("Analyze sales performance across stores and departments with meaningful comparisons.")
 
     # --- Monthly Sales Trend (Overall, no store/dept filter) ---
-    monthly_order = [
-        'January', 'February', 'March', 'April', 'May', 'June',
-        'July', 'August', 'September', 'October', 'November', 'December'
-    ]
-    monthly_sales = (
-        df.groupby('Month_Name')['Weekly_Sales']
-        .sum()
-        .reindex(monthly_order)
-        .reset_index()
-        .rename(columns={'Month_Name': 'Month', 'Weekly_Sales': 'Sales'})
-    )
+    monthly_sales = monthly_totals(df)
     fig_monthly_trend = px.line(
         monthly_sales,
         x='Month',
@@ -228,7 +437,7 @@ with tab2:
         markers=True,
         labels={"Sales": "Total Sales", "Month": "Month"}
     )
-    fig_monthly_trend.update_layout(xaxis=dict(categoryorder='array', categoryarray=monthly_order))
+    fig_monthly_trend.update_layout(xaxis=dict(categoryorder='array', categoryarray=MONTHLY_ORDER))
     st.plotly_chart(fig_monthly_trend, use_container_width=True)
     st.markdown("✅ **Insight:** Observe seasonal patterns and sales cycles across the year.")
 
@@ -237,17 +446,12 @@ with tab2:
     # --- Sales by Store Size (Filtered by Store) ---
     store_for_size = st.selectbox(
         "🏪 Select Store for Store Size Sales Chart",
-        options=sorted(df['Store'].unique()),
+        options=store_options,
         key='store_size_filter'
     )
-    df_size_filtered = df[df['Store'] == store_for_size]
-    if 'Size' in df_size_filtered.columns:
-        size_sales = (
-            df_size_filtered.groupby('Size')['Weekly_Sales']
-            .sum()
-            .reset_index()
-            .sort_values('Size')
-        )
+    if 'Size' in df.columns:
+        store_sizes = store_size_totals(df)
+        size_sales = store_sizes[store_sizes['Store'] == store_for_size].drop(columns='Store')
         fig_size = px.bar(
             size_sales,
             x='Size',
@@ -267,16 +471,21 @@ with tab2:
     # --- Weekly Sales Distribution (Filtered by Dept) ---
     dept_for_sales = st.selectbox(
         "📦 Select Department for Sales Distribution",
-        options=sorted(df['Dept'].unique()),
+        options=dept_options,
         key='dept_sales_filter'
     )
-    df_dept_filtered = df[df['Dept'] == dept_for_sales]
-    fig_hist = px.histogram(
-        df_dept_filtered,
-        x='Weekly_Sales',
-        nbins=30,
+    # Bin once with NumPy and draw the counts as bars
+    counts, edges = session_memo(f"hist_{dept_for_sales}", dept_histogram, df, dept_for_sales)
+    fig_hist = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges)
+    ))
+    fig_hist.update_layout(
         title=f"📊 Weekly Sales Distribution for Department {dept_for_sales}",
-        labels={'Weekly_Sales': 'Weekly Sales'}
+        xaxis_title="Weekly Sales",
+        yaxis_title="count",
+        bargap=0
     )
     st.plotly_chart(fig_hist, use_container_width=True)
     st.markdown("✅ **Insight:** Understand the sales variability within the selected department.")
@@ -285,13 +494,7 @@ with tab2:
 
     # --- Top Departments by Sales (Overall) ---
     top_n = st.slider("🎯 Number of Top Departments to Show", 5, 20, 10, key='top_dept_slider')
-    dept_sales = (
-        df.groupby('Dept')['Weekly_Sales']
-        .sum()
-        .reset_index()
-        .sort_values('Weekly_Sales', ascending=False)
-        .head(top_n)
-    )
+    dept_sales = dept_totals(df).head(top_n)
     fig_top_depts = px.bar(
         dept_sales,
         y='Dept',
@@ -310,11 +513,7 @@ with tab2:
 
    # --- Average Sales by Fuel Price Range ---
 
-    fuel_bins = pd.cut(df['Fuel_Price'], bins=5)
-    df['Fuel_Bin'] = fuel_bins.astype(str)  # Convert to string for plotting
-
-    fuel_sales = df.groupby('Fuel_Bin')['Weekly_Sales'].mean().reset_index()
-    fuel_sales.columns = ['Fuel Price Range', 'Average Weekly Sales']
+    fuel_sales = fuel_bin_means(df)
 
     fig_fuel_bar = px.bar(
         fuel_sales,
@@ -332,11 +531,7 @@ with tab2:
 
     # --- Average Sales by Temperature Range ---
 
-    temp_bins = pd.cut(df['Temperature'], bins=6)
-    df['Temp_Bin'] = temp_bins.astype(str)  # Convert to string for plotting
-
-    temp_sales = df.groupby('Temp_Bin')['Weekly_Sales'].mean().reset_index()
-    temp_sales.columns = ['Temperature Range', 'Average Weekly Sales']
+    temp_sales = temp_bin_means(df)
 
     fig_temp_bar = px.bar(
         temp_sales,
@@ -355,12 +550,7 @@ with tab2:
 
     # --- Store Type Analysis ---
     if 'Type' in df.columns:
-        type_sales = (
-            df.groupby('Type')['Weekly_Sales']
-            .sum()
-            .reset_index()
-            .sort_values('Weekly_Sales', ascending=False)
-        )
+        type_sales = type_totals(df)
         fig_type = px.bar(
             type_sales,
             x='Type',
@@ -380,8 +570,10 @@ with tab3:
 
     # 1. Holiday vs Non-Holiday Comparison
     st.markdown("### 📊 Average Sales: Holiday vs Non-Holiday Weeks")
-    holiday_comparison = df.copy()
-    holiday_comparison['Holiday_Flag'] = holiday_comparison['IsHoliday_x'].replace({True: 'Holiday', False: 'Non-Holiday'})
+    holiday_comparison = pd.DataFrame({
+        'Holiday_Flag': np.where(df['IsHoliday_x'].to_numpy(), 'Holiday', 'Non-Holiday'),
+        'Weekly_Sales': df['Weekly_Sales'].to_numpy()
+    })
     holiday_avg = (
         holiday_comparison.groupby('Holiday_Flag')['Weekly_Sales']
         .mean()
@@ -404,12 +596,12 @@ with tab3:
 
     # 2. Sales by Specific Holidays
     st.markdown("### 🎯 Sales Comparison by Holiday Type")
-    df_holidays = df.copy()
-    df_holidays['Holiday_Type'] = 'None'
-    df_holidays.loc[df_holidays['IsSuperBowl'], 'Holiday_Type'] = 'Super Bowl'
-    df_holidays.loc[df_holidays['IsLaborDay'], 'Holiday_Type'] = 'Labor Day'
-    df_holidays.loc[df_holidays['IsThanksgiving'], 'Holiday_Type'] = 'Thanksgiving'
-    df_holidays.loc[df_holidays['IsChristmas'], 'Holiday_Type'] = 'Christmas'
+    # Only the columns the chart needs, so the full dataset is never copied
+    df_holidays = pd.DataFrame({
+        'Year': df['Year'].to_numpy(),
+        'Holiday_Type': holiday_type(df),
+        'Weekly_Sales': df['Weekly_Sales'].to_numpy()
+    })
 
     holiday_sales = (
         df_holidays[df_holidays['Holiday_Type'] != 'None']
@@ -434,23 +626,7 @@ with tab3:
     # 3. Sales Trends Around Holidays (2 weeks before & after)
     st.markdown("### 📈 Sales Trend: 2 Weeks Before and After Holidays")
 
-    def get_holiday_windows(holiday_dates, name):
-        holiday_trend_list = []
-        for date in holiday_dates:
-            window = df[(df['Date'] >= date - pd.Timedelta(weeks=2)) & (df['Date'] <= date + pd.Timedelta(weeks=2))].copy()
-            window['Event'] = name
-            window['Delta_Week'] = (window['Date'] - date).dt.days // 7
-            holiday_trend_list.append(window)
-        return pd.concat(holiday_trend_list)
-
-    combined_trends = pd.concat([
-        get_holiday_windows(pd.to_datetime(['2010-02-12', '2011-02-11', '2012-02-10', '2013-02-08']), 'Super Bowl'),
-        get_holiday_windows(pd.to_datetime(['2010-09-10', '2011-09-09', '2012-09-07', '2013-09-06']), 'Labor Day'),
-        get_holiday_windows(pd.to_datetime(['2010-11-26', '2011-11-25', '2012-11-23', '2013-11-29']), 'Thanksgiving'),
-        get_holiday_windows(pd.to_datetime(['2010-12-31', '2011-12-30', '2012-12-28', '2013-12-27']), 'Christmas')
-    ])
-
-    trend_chart = combined_trends.groupby(['Delta_Week', 'Event'])['Weekly_Sales'].mean().reset_index()
+    trend_chart = compute_holiday_trend(df)
 
     fig_trend = px.line(
         trend_chart,
@@ -472,58 +648,19 @@ with tab3:
     with col1:
         store_holiday = st.selectbox(
             "🏪 Select Store",
-            options=sorted(df['Store'].unique()),
+            options=store_options,
             key='store_holiday_lift'
         )
 
     with col2:
         dept_holiday = st.selectbox(
             "📦 Select Department",
-            options=sorted(df['Dept'].unique()),
+            options=dept_options,
             key='dept_holiday_lift'
         )
 
-    # Filter data by store and dept
-    df_filtered = df[(df['Store'] == store_holiday) & (df['Dept'] == dept_holiday)].copy()
-
-    # Create Holiday_Type column based on holiday flags
-    def get_holiday_type(row):
-        if row.get('IsSuperBowl', False):
-            return 'Super Bowl'
-        elif row.get('IsLaborDay', False):
-            return 'Labor Day'
-        elif row.get('IsThanksgiving', False):
-            return 'Thanksgiving'
-        elif row.get('IsChristmas', False):
-            return 'Christmas'
-        else:
-            return 'None'
-
-    df_filtered['Holiday_Type'] = df_filtered.apply(get_holiday_type, axis=1)
-
-    # Filter out 'None' to compare holidays with non-holiday weeks
-    holiday_types = [ht for ht in df_filtered['Holiday_Type'].unique() if ht != 'None']
-
-    results = []
-
-    for ht in holiday_types:
-        holiday_sales_avg = df_filtered[df_filtered['Holiday_Type'] == ht]['Weekly_Sales'].mean()
-        non_holiday_sales_avg = df_filtered[df_filtered['Holiday_Type'] == 'None']['Weekly_Sales'].mean()
-
-        # Avoid division by zero
-        if not non_holiday_sales_avg or pd.isna(non_holiday_sales_avg):
-            lift_pct = None
-        else:
-            lift_pct = ((holiday_sales_avg - non_holiday_sales_avg) / non_holiday_sales_avg) * 100
-
-        results.append({
-            "Holiday_Type": ht,
-            "Holiday_Week_Avg_Sales": holiday_sales_avg,
-            "Non_Holiday_Week_Avg_Sales": non_holiday_sales_avg,
-            "Sales_Lift_Percent": lift_pct
-        })
-
-    df_lift = pd.DataFrame(results).dropna()
+    # Only recomputed when this store/dept pair has not been seen in the session
+    df_lift = session_memo(f"lift_{store_holiday}_{dept_holiday}", compute_lift, df, store_holiday, dept_holiday)
 
     if df_lift.empty:
         st.info("No holiday data available for this store and department.")
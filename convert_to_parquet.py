@@ -0,0 +1,13 @@
+import pandas as pd
+
+# --- Convert the cleaned dataset to Parquet for faster dashboard loading ---
+# Run once after regenerating merged_data.csv: python convert_to_parquet.py
+df = pd.read_csv('merged_data.csv', parse_dates=['Date'])
+
+# Downcast to compact dtypes (Weekly_Sales stays float64 so totals keep cent precision)
+df['Store'] = df['Store'].astype('int16')
+df['Dept'] = df['Dept'].astype('int16')
+df['Month_Name'] = df['Month_Name'].astype('category')
+df['Type'] = df['Type'].astype('category')
+
+df.to_parquet('merged_data.parquet', index=False)